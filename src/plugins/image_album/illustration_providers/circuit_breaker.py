@@ -0,0 +1,72 @@
+"""
+Circuit breaker for illustration provider API calls.
+
+After repeated failures (rate limiting, server errors, connection resets) the
+breaker opens and calls are skipped for reset_timeout seconds. It then goes
+half-open and lets a single trial call through: success closes it again,
+failure re-opens it for another reset_timeout.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed/open/half-open breaker shared by all callers of one API."""
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state()
+
+    def _state(self) -> str:
+        if self._opened_at is None:
+            return CLOSED
+        if time.monotonic() - self._opened_at >= self.reset_timeout:
+            return HALF_OPEN
+        return OPEN
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be made now."""
+        with self._lock:
+            state = self._state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("Circuit closed after successful trial call")
+            self._failures = 0
+            self._opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._trial_in_flight or self._failures >= self.failure_threshold:
+                logger.warning(
+                    f"Circuit opened after {self._failures} consecutive failures, "
+                    f"skipping calls for {self.reset_timeout}s"
+                )
+                self._opened_at = time.monotonic()
+            self._trial_in_flight = False
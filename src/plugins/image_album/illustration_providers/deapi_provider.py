@@ -9,10 +9,14 @@ WebSockets: https://docs.deapi.ai/execution-modes-and-integrations/websockets
 
 import io
 import logging
+import random
+import time
 from PIL import Image
+from requests_toolbelt.multipart.encoder import MultipartEncoder
 
 from utils.http_client import get_http_session
 from plugins.image_album.illustration_providers.base import BaseIllustrationProvider
+from plugins.image_album.illustration_providers.circuit_breaker import CircuitBreaker, OPEN
 from plugins.image_album.illustration_providers.prompts import get_illustration_prompt
 from plugins.image_album.illustration_providers.deapi_websocket import wait_for_result
 
@@ -24,6 +28,18 @@ STATUS_ENDPOINT = f"{API_BASE}/api/v1/client/request-status"
 DEFAULT_MODEL = "Flux_2_Klein_4B_BF16"
 MAX_WAIT_TIME = 300
 
+# Status polling backoff: min(POLL_MAX_INTERVAL, POLL_BASE_INTERVAL * 2**attempt) + jitter
+POLL_BASE_INTERVAL = 2
+POLL_MAX_INTERVAL = 16
+POLL_JITTER = 0.5
+
+# Multipart (filename, content type) per upload encoding
+UPLOAD_FILE_TYPES = {
+    "JPEG": ("image.jpg", "image/jpeg"),
+    "WEBP": ("image.webp", "image/webp"),
+    "PNG": ("image.png", "image/png"),
+}
+
 
 class DeAPIIllustrationProvider(BaseIllustrationProvider):
     """Convert photos to illustrations via deAPI (https://deapi.ai)."""
@@ -33,6 +49,16 @@ class DeAPIIllustrationProvider(BaseIllustrationProvider):
     requires_api_key = True
     expected_key = "DEAPI_TOKEN"
 
+    # Upload encoding: photos compress far better as JPEG/WebP than PNG, and the
+    # server re-decodes them anyway. Must be a key of UPLOAD_FILE_TYPES.
+    UPLOAD_FORMAT = "JPEG"
+    UPLOAD_QUALITY = 90
+    # zlib level for the PNG fallback (Pillow defaults to 6)
+    PNG_COMPRESS_LEVEL = 1
+
+    # Shared across instances: stop submitting jobs while deAPI is rate limiting or failing
+    _breaker = CircuitBreaker(failure_threshold=3, reset_timeout=300)
+
     def __init__(
         self,
         api_key: str | None = None,
@@ -45,6 +71,11 @@ class DeAPIIllustrationProvider(BaseIllustrationProvider):
         self.model = model
         self.session = get_http_session()
 
+        # Static request parts, built once per provider instance
+        self._base_headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "application/json"}
+        self._base_data = {"model": self.model, "steps": "4", "seed": "42"}
+        self._status_url_tmpl = f"{STATUS_ENDPOINT}/{{request_id}}"
+
     def to_illustration(
         self,
         image: Image.Image,
@@ -66,34 +97,45 @@ class DeAPIIllustrationProvider(BaseIllustrationProvider):
             logger.error("deAPI API key not configured")
             return None
 
+        # Cheap, non-claiming check so no encoding work is done while the circuit is open
+        if self._breaker.state == OPEN:
+            logger.warning("deAPI circuit open after repeated failures, skipping illustration")
+            return None
+
         prompt = prompt or get_illustration_prompt(is_person=is_person)
 
         try:
-            img_rgb = image.convert("RGB") if image.mode != "RGB" else image
-            buffer = io.BytesIO()
-            img_rgb.save(buffer, format="PNG")
-            buffer.seek(0)
-
-            headers = {"Authorization": f"Bearer {self.api_key}", "Accept": "application/json"}
+            filename, payload, content_type = self._encode_for_upload(image)
 
-            # Submit img2img request (multipart/form-data)
-            files = {"image": ("image.png", buffer, "image/png")}
-            data = {
+            # Submit img2img request (multipart/form-data), streamed from the encoded bytes
+            encoder = MultipartEncoder(fields={
+                **self._base_data,
                 "prompt": prompt,
-                "model": self.model,
-                "steps": 4,
-                "seed": 42,
-                "guidance": guidance_scale,
-            }
+                "guidance": str(guidance_scale),
+                "image": (filename, payload, content_type),
+            })
+
+            if not self._breaker.allow_request():
+                logger.warning("deAPI circuit open after repeated failures, skipping illustration")
+                return None
 
             logger.info("Sending image to deAPI for illustration conversion...")
-            resp = self.session.post(
-                IMG2IMG_ENDPOINT,
-                data=data,
-                files=files,
-                headers=headers,
-                timeout=30,
-            )
+            try:
+                resp = self.session.post(
+                    IMG2IMG_ENDPOINT,
+                    data=encoder,
+                    headers={**self._base_headers, "Content-Type": encoder.content_type},
+                    timeout=30,
+                )
+            except Exception:
+                # Connection resets/timeouts count against the breaker too
+                self._breaker.record_failure()
+                raise
+
+            if resp.status_code == 429 or resp.status_code >= 500:
+                self._breaker.record_failure()
+            else:
+                self._breaker.record_success()
 
             if resp.status_code != 200:
                 err_msg = resp.text or resp.reason
@@ -118,16 +160,14 @@ class DeAPIIllustrationProvider(BaseIllustrationProvider):
                     timeout=MAX_WAIT_TIME,
                 )
                 if ws_result and ws_result.get("result_url"):
-                    img_resp = self.session.get(ws_result["result_url"], timeout=60)
-                    if img_resp.status_code == 200:
-                        out_img = Image.open(io.BytesIO(img_resp.content)).convert("RGB")
-                    else:
+                    out_img = self._fetch_result_image(ws_result["result_url"])
+                    if out_img is None:
                         logger.warning("Failed to fetch WebSocket result URL, falling back to polling")
                 else:
                     logger.warning("WebSocket did not return result, falling back to polling")
 
             if out_img is None:
-                out_img = self._poll_for_result(request_id, headers)
+                out_img = self._poll_for_result(request_id)
 
             if out_img:
                 logger.info(f"Illustration generated: {out_img.size[0]}x{out_img.size[1]}")
@@ -137,18 +177,64 @@ class DeAPIIllustrationProvider(BaseIllustrationProvider):
             logger.error(f"Illustration conversion failed: {e}")
             return None
 
-    def _poll_for_result(self, request_id: str, headers: dict) -> Image.Image | None:
-        """Fallback: poll request-status until done."""
-        import time
+    def _encode_for_upload(self, image: Image.Image) -> tuple[str, bytes, str]:
+        """
+        Return (filename, encoded bytes, content_type) for the multipart image field.
+
+        The encoded image is the only image-sized buffer handed to the upload:
+        BytesIO.getvalue() returns its storage without copying.
+        """
+        img_rgb = image.convert("RGB") if image.mode != "RGB" else image
+        buffer = io.BytesIO()
+        save_kwargs = {}
+        if self.UPLOAD_FORMAT in ("JPEG", "WEBP"):
+            save_kwargs = {"quality": self.UPLOAD_QUALITY}
+            if self.UPLOAD_FORMAT == "JPEG":
+                save_kwargs.update(optimize=False, progressive=False)
+        elif self.UPLOAD_FORMAT == "PNG":
+            # Lossless fallback: fastest deflate level, the payload is decoded once server-side
+            save_kwargs = {"compress_level": self.PNG_COMPRESS_LEVEL}
+        img_rgb.save(buffer, format=self.UPLOAD_FORMAT, **save_kwargs)
+        encoded = buffer.getvalue()
+        logger.debug(f"Encoded upload as {self.UPLOAD_FORMAT} ({len(encoded) / 1024:.1f}KB)")
 
-        url = f"{STATUS_ENDPOINT}/{request_id}"
-        POLL_INTERVAL = 2
-        start = time.monotonic()
+        filename, content_type = UPLOAD_FILE_TYPES[self.UPLOAD_FORMAT]
+        return filename, encoded, content_type
+
+    def _fetch_result_image(self, result_url: str) -> Image.Image | None:
+        """Download the generated image (shared by the WebSocket and polling paths)."""
+        img_resp = self.session.get(result_url, timeout=60)
+        if img_resp.status_code != 200:
+            logger.error(f"Failed to fetch result image: {img_resp.status_code}")
+            return None
+        return Image.open(io.BytesIO(img_resp.content)).convert("RGB")
+
+    def _poll_for_result(self, request_id: str) -> Image.Image | None:
+        """
+        Fallback: poll request-status until done.
+
+        Backs off exponentially (with jitter), resets to the base interval only when
+        the job status changes (not on progress ticks), and honors Retry-After on
+        rate-limited (429) responses.
+        """
+        url = self._status_url_tmpl.format(request_id=request_id)
+        deadline = time.monotonic() + MAX_WAIT_TIME
+        attempt = 0
+        last_status = None
 
         logger.info(f"Polling status for request {request_id}")
 
-        while (time.monotonic() - start) < MAX_WAIT_TIME:
-            resp = self.session.get(url, headers=headers, timeout=30)
+        while time.monotonic() < deadline:
+            resp = self.session.get(url, headers=self._base_headers, timeout=30)
+            retry_after = _parse_retry_after(resp.headers.get("Retry-After"))
+
+            if resp.status_code == 429:
+                delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+                attempt += 1
+                logger.warning(f"deAPI status rate limited, retrying in {delay:.1f}s")
+                time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+                continue
+
             if resp.status_code != 200:
                 logger.error(f"deAPI status error {resp.status_code}: {resp.text}")
                 return None
@@ -161,17 +247,35 @@ class DeAPIIllustrationProvider(BaseIllustrationProvider):
                 if not result_url:
                     logger.error("deAPI done but no result_url")
                     return None
-                img_resp = self.session.get(result_url, timeout=60)
-                if img_resp.status_code != 200:
-                    logger.error(f"Failed to fetch result image: {img_resp.status_code}")
-                    return None
-                return Image.open(io.BytesIO(img_resp.content)).convert("RGB")
+                return self._fetch_result_image(result_url)
 
             if status == "error":
                 logger.error(f"deAPI job failed: {data}")
                 return None
 
-            time.sleep(POLL_INTERVAL)
+            if status != last_status:
+                attempt = 0
+                last_status = status
+
+            delay = retry_after if retry_after is not None else _backoff_delay(attempt)
+            attempt += 1
+            logger.debug(f"deAPI job {status}, next status check in {delay:.1f}s")
+            time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
 
         logger.error("deAPI job timed out waiting for result")
         return None
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Capped exponential backoff with random jitter."""
+    return min(POLL_MAX_INTERVAL, POLL_BASE_INTERVAL * 2 ** attempt) + random.uniform(0, POLL_JITTER)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    """Parse a Retry-After header given in seconds; HTTP-date values are ignored."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
@@ -6,7 +6,7 @@ Uses Pusher-compatible protocol per https://docs.deapi.ai/execution-modes-and-in
 
 import json
 import logging
-import threading
+import time
 
 import websocket
 
@@ -15,6 +15,9 @@ logger = logging.getLogger(__name__)
 PUSHER_KEY = "depin-api-prod-key"
 WS_URL = f"wss://soketi.deapi.ai/app/{PUSHER_KEY}?protocol=7&client=inky"
 AUTH_URL = "https://api.deapi.ai/broadcasting/auth"
+CONNECT_TIMEOUT = 10
+# Events _handle_message acts on; any other frame is dropped without parsing
+HANDLED_EVENTS = ("pusher:ping", "pusher:connection_established", "request.status.updated")
 
 
 def wait_for_result(
@@ -26,66 +29,78 @@ def wait_for_result(
 ) -> dict | None:
     """
     Connect via WebSocket, wait for request.status.updated with result_url.
+    Runs on the calling thread, reading frames against a single deadline.
     Returns dict with result_url when done, or None on timeout/error.
     """
-    result_holder: list[dict | None] = [None]
-    done = threading.Event()
-    ws_ref: list = []
-
-    def on_message(ws, message):
-        try:
-            data = json.loads(message)
-            event = data.get("event")
-            if event == "pusher:connection_established":
-                conn_data = json.loads(data.get("data", "{}"))
-                socket_id = conn_data.get("socket_id")
-                if socket_id:
-                    _subscribe_private_channel(ws, api_token, client_id, socket_id, session)
-            elif event == "request.status.updated":
-                payload = json.loads(data.get("data", "{}"))
-                if payload.get("request_id") == request_id:
-                    status = payload.get("status")
-                    progress = payload.get("progress", "")
-                    if progress:
-                        logger.info(f"deAPI illustration: {progress}% complete")
-                    if status == "done":
-                        result_holder[0] = payload
-                        done.set()
-                        ws.close()
-                    elif status == "error":
-                        logger.error(f"deAPI job error: {payload}")
-                        done.set()
-                        ws.close()
-        except Exception as e:
-            logger.debug(f"WebSocket message parse error: {e}")
-
-    def on_error(ws, error):
-        logger.error(f"deAPI WebSocket error: {error}")
-        done.set()
-
-    def on_close(ws, close_status, close_msg):
-        done.set()
-
-    def run_ws():
-        ws = websocket.WebSocketApp(
+    deadline = time.monotonic() + timeout
+    try:
+        ws = websocket.create_connection(
             WS_URL,
-            on_message=on_message,
-            on_error=on_error,
-            on_close=on_close,
+            timeout=min(timeout, CONNECT_TIMEOUT),
+            skip_utf8_validation=True,
         )
-        ws_ref.append(ws)
-        ws.run_forever()
+    except Exception as e:
+        logger.error(f"deAPI WebSocket error: {e}")
+        return None
 
-    thread = threading.Thread(target=run_ws, daemon=True)
-    thread.start()
-
-    if done.wait(timeout=timeout):
-        return result_holder[0]
-    if ws_ref:
-        ws_ref[0].close()
+    try:
+        while (remaining := deadline - time.monotonic()) > 0:
+            ws.settimeout(remaining)
+            message = ws.recv()
+            finished, result = _handle_message(
+                ws, message, request_id, api_token, client_id, session
+            )
+            if finished:
+                return result
+    except websocket.WebSocketTimeoutException:
+        pass
+    except websocket.WebSocketConnectionClosedException:
+        logger.debug("deAPI WebSocket closed before result arrived")
+    except Exception as e:
+        logger.error(f"deAPI WebSocket error: {e}")
+    finally:
+        ws.close()
     return None
 
 
+def _handle_message(
+    ws, message, request_id: str, api_token: str, client_id: str, session
+) -> tuple[bool, dict | None]:
+    """Process one Pusher frame. Returns (finished, result payload or None)."""
+    try:
+        if not any(event in message for event in HANDLED_EVENTS):
+            return False, None
+        data = json.loads(message)
+        event = data.get("event")
+        if event == "pusher:ping":
+            # Pusher drops connections that don't answer its idle pings
+            ws.send(json.dumps({"event": "pusher:pong", "data": {}}))
+        elif event == "pusher:connection_established":
+            conn_data = json.loads(data.get("data", "{}"))
+            socket_id = conn_data.get("socket_id")
+            if socket_id:
+                _subscribe_private_channel(ws, api_token, client_id, socket_id, session)
+        elif event == "request.status.updated":
+            inner = data.get("data", "{}")
+            # Updates for other jobs on this client's channel: skip the inner parse
+            if isinstance(inner, str) and request_id not in inner:
+                return False, None
+            payload = json.loads(inner) if isinstance(inner, str) else inner
+            if payload.get("request_id") == request_id:
+                status = payload.get("status")
+                progress = payload.get("progress", "")
+                if progress:
+                    logger.info(f"deAPI illustration: {progress}% complete")
+                if status == "done":
+                    return True, payload
+                if status == "error":
+                    logger.error(f"deAPI job error: {payload}")
+                    return True, None
+    except Exception as e:
+        logger.debug(f"WebSocket message parse error: {e}")
+    return False, None
+
+
 def _subscribe_private_channel(
     ws, api_token: str, client_id: str, socket_id: str, session
 ) -> None:
@@ -1,12 +1,16 @@
+import json
 import logging
-import re
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from random import choice
 
 from PIL import Image, ImageColor, ImageOps
 from utils.http_client import get_http_session
 from plugins.base_plugin.base_plugin import BasePlugin
-from utils.image_utils import pad_image_blur
+from utils.image_utils import blur_background, pad_image_blur
 from plugins.image_album.illustration_providers import get_illustration_provider
 
 logger = logging.getLogger(__name__)
@@ -15,37 +19,185 @@ logger = logging.getLogger(__name__)
 PROJECT_ROOT = Path(__file__).resolve().parents[3]
 ILLUSTRATIONS_DIR = PROJECT_ROOT / "Illustrations"
 
+# Immich /api/search/metadata paging
+ALBUM_PAGE_SIZE = 1000
+ALBUM_PAGE_CONCURRENCY = 8
+
+# On-disk cache of Immich listings, revalidated via ETag when the server sends one
+LISTING_CACHE_FILE = ILLUSTRATIONS_DIR / ".cache" / "immich_listings.json"
+LISTING_CACHE_TTL = 300  # seconds; used when no ETag is available
+# Asset fields kept in cached listings (all this plugin reads)
+CACHED_ASSET_FIELDS = ("id", "originalFileName", "width", "height")
+
+# Saves illustrations in the background so generate_image doesn't wait on disk I/O;
+# a single worker keeps writes to the same path serialized
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image_album")
+
+# Characters stripped from path components by _sanitize_filename
+_FORBIDDEN_FILENAME_CHARS = str.maketrans("", "", '/\\:*?"<>|')
+
+# Ring buffer of asset ids with a saved illustration, favoured when picking the next asset
+RECENT_ILLUSTRATIONS_FILE = ILLUSTRATIONS_DIR / ".recent.json"
+MAX_RECENT_ILLUSTRATIONS = 200
+
 
 def _sanitize_filename(name: str) -> str:
     """Sanitize string for use as filesystem path component."""
-    s = (name or "unknown").strip()
-    s = re.sub(r'[/\\:*?"<>|]', "", s)
-    return s or "unknown"
+    return (name or "unknown").strip().translate(_FORBIDDEN_FILENAME_CHARS) or "unknown"
 
 
-def _save_illustration(
-    img: Image.Image,
+def _load_listing_cache() -> dict:
+    try:
+        with open(LISTING_CACHE_FILE, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _get_cached_listing(key: str) -> dict | None:
+    """Return cache entry {"etag", "fetched_at", "value"} for key, or None."""
+    return _load_listing_cache().get(key)
+
+
+def _store_cached_listing(key: str, value, etag: str | None) -> None:
+    cache = _load_listing_cache()
+    cache[key] = {"etag": etag, "fetched_at": time.time(), "value": value}
+    try:
+        LISTING_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = LISTING_CACHE_FILE.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, LISTING_CACHE_FILE)
+    except OSError as e:
+        logger.warning(f"Could not write Immich listing cache: {e}")
+
+
+def _is_fresh_without_etag(entry: dict | None) -> bool:
+    """True if entry can be served without revalidation (no ETag, still within TTL)."""
+    return bool(entry) and not entry.get("etag") and time.time() - entry.get("fetched_at", 0) < LISTING_CACHE_TTL
+
+
+def _trim_assets(assets: list[dict]) -> list[dict]:
+    return [{k: a[k] for k in CACHED_ASSET_FIELDS if k in a} for a in assets]
+
+
+def _load_recent_illustrations() -> list[str]:
+    try:
+        with open(RECENT_ILLUSTRATIONS_FILE, "r") as f:
+            recent = json.load(f)
+        return recent if isinstance(recent, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def _remember_illustration(asset_id: str) -> None:
+    """Append asset_id to the recently illustrated ring buffer."""
+    recent = [i for i in _load_recent_illustrations() if i != asset_id]
+    recent.append(asset_id)
+    try:
+        ILLUSTRATIONS_DIR.mkdir(parents=True, exist_ok=True)
+        tmp_path = RECENT_ILLUSTRATIONS_FILE.with_suffix(".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(recent[-MAX_RECENT_ILLUSTRATIONS:], f)
+        os.replace(tmp_path, RECENT_ILLUSTRATIONS_FILE)
+    except OSError as e:
+        logger.warning(f"Could not record recent illustration: {e}")
+
+
+def _choose_asset(assets: list[dict], prefer_illustrated: bool = False) -> dict:
+    """
+    Pick a random asset. With prefer_illustrated, a pick without a saved illustration
+    is redrawn once: with a fraction p of assets illustrated, the saved file is reused
+    with probability 2p - p^2 instead of p, while new assets still get illustrated.
+    """
+    selected = choice(assets)
+    if prefer_illustrated and selected["id"] not in _load_recent_illustrations():
+        logger.debug(f"Asset {selected['id']} has no saved illustration, drawing again")
+        selected = choice(assets)
+    return selected
+
+
+def _illustration_path(
     *,
     person_name: str | None,
     album: str | None,
     asset: dict,
-) -> None:
-    """Save illustrated image to Illustrations/{personName|album}/{originalFileName}.EXT"""
+    legacy: bool = False,
+) -> Path:
+    """
+    Path of the saved illustration: Illustrations/{personName|album}/{originalFileName}_{assetId}.jpeg
+
+    The asset id keeps assets that share an original file name (e.g. IMG_0001.JPG)
+    from being served each other's illustration. With legacy, returns the
+    {originalFileName}.jpeg name used before the id was added.
+    """
     original_filename = asset.get("originalFileName") or asset.get("id", "illustration")
-    # Preserve extension from original, default to png
-    ext = ".jpeg"
     base_name = Path(original_filename).stem or "illustration"
-    safe_filename = _sanitize_filename(base_name) + ext
+    if asset.get("id") and not legacy:
+        base_name = f"{base_name}_{asset['id']}"
+    safe_filename = _sanitize_filename(base_name) + ".jpeg"
 
     folder = _sanitize_filename(person_name) if person_name else _sanitize_filename(album) or "album"
-    out_dir = ILLUSTRATIONS_DIR / folder
-    out_dir.mkdir(parents=True, exist_ok=True)
+    return ILLUSTRATIONS_DIR / folder / safe_filename
+
+
+def _load_existing_illustration(path: Path) -> Image.Image | None:
+    """Load a previously saved illustration; unreadable files are deleted and None returned."""
+    if not path.exists():
+        return None
+    try:
+        with Image.open(path) as existing:
+            return existing.convert("RGB")
+    except OSError as e:
+        logger.warning(f"Discarding unreadable illustration {path}: {e}")
+        try:
+            path.unlink()
+        except OSError:
+            pass
+        return None
+
+
+def _load_saved_illustration(
+    *,
+    person_name: str | None,
+    album: str | None,
+    asset: dict,
+) -> Image.Image | None:
+    """Load the saved illustration of asset, falling back to its legacy (pre-asset-id) name."""
+    for legacy in (False, True):
+        path = _illustration_path(person_name=person_name, album=album, asset=asset, legacy=legacy)
+        img = _load_existing_illustration(path)
+        if img:
+            logger.info(f"Using existing illustration {path}")
+            return img
+    return None
 
-    out_path = out_dir / safe_filename
-    save_kwargs = {"quality": 95} if ext.lower() in (".jpg", ".jpeg") else {}
-    img.save(out_path, **save_kwargs)
+
+def _save_illustration(
+    img: Image.Image,
+    *,
+    person_name: str | None,
+    album: str | None,
+    asset: dict,
+) -> None:
+    """Save illustrated image to the path given by _illustration_path."""
+    out_path = _illustration_path(person_name=person_name, album=album, asset=asset)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+
+    # Write beside the target and rename, so a refresh never reads a half-written file
+    tmp_path = out_path.with_suffix(".tmp")
+    img.save(tmp_path, format="JPEG", quality=95)
+    os.replace(tmp_path, out_path)
     logger.info(f"Saved illustration to {out_path}")
 
+    if asset.get("id"):
+        _remember_illustration(asset["id"])
+
+
+def _log_save_failure(future) -> None:
+    if future.exception():
+        logger.error(f"Failed to save illustration: {future.exception()}")
+
 
 class ImmichProvider:
     def __init__(self, base_url: str, key: str, image_loader):
@@ -57,9 +209,12 @@ class ImmichProvider:
 
     def get_album_id(self, album: str) -> str:
         logger.debug(f"Fetching albums from {self.base_url}")
-        r = self.session.get(f"{self.base_url}/api/albums", headers=self.headers)
-        r.raise_for_status()
-        albums = r.json()
+        albums = self._cached_request(
+            "albums",
+            "GET",
+            "/api/albums",
+            transform=lambda albums: [{"id": a["id"], "albumName": a["albumName"]} for a in albums],
+        )
 
         matching_albums = [a for a in albums if a["albumName"] == album]
         if not matching_albums:
@@ -67,11 +222,44 @@ class ImmichProvider:
 
         return matching_albums[0]["id"]
 
+    def _cached_request(self, cache_key: str, method: str, path: str, transform=None, **kwargs):
+        """
+        Issue an Immich API request through the on-disk listing cache.
+
+        Sends If-None-Match when an ETag is cached and reuses the cached value on 304;
+        without an ETag, a cached value is reused for LISTING_CACHE_TTL seconds.
+        """
+        key = f"{self.base_url}|{cache_key}"
+        cached = _get_cached_listing(key)
+        if _is_fresh_without_etag(cached):
+            logger.debug(f"Using cached Immich listing for {cache_key}")
+            return cached["value"]
+
+        headers = dict(self.headers)
+        if cached and cached.get("etag"):
+            headers["If-None-Match"] = cached["etag"]
+
+        r = self.session.request(method, f"{self.base_url}{path}", headers=headers, **kwargs)
+        if r.status_code == 304 and cached:
+            logger.debug(f"Immich listing for {cache_key} not modified")
+            return cached["value"]
+        r.raise_for_status()
+
+        value = r.json()
+        if transform:
+            value = transform(value)
+        _store_cached_listing(key, value, r.headers.get("ETag"))
+        return value
+
     def get_person_id(self, person_name: str) -> str:
         logger.debug(f"Fetching persons from {self.base_url}")
-        r = self.session.get(f"{self.base_url}/api/search/person?name={person_name}", headers=self.headers)
-        r.raise_for_status()
-        persons = r.json()
+        persons = self._cached_request(
+            f"person:{person_name}",
+            "GET",
+            "/api/search/person",
+            params={"name": person_name},
+            transform=lambda persons: [{"id": p["id"]} for p in persons],
+        )
         logger.info(f"Found {persons}")
         if not persons:
             raise RuntimeError(f"Person '{person_name}' not found.")
@@ -84,33 +272,98 @@ class ImmichProvider:
             "personIds": [person_id],
             "type": "IMAGE"
             }
-        r = self.session.post(f"{self.base_url}/api/search/random", json=body, headers=self.headers)
-        r.raise_for_status()
-        items = r.json()
+        items = self._cached_request(
+            f"person-assets:{person_id}",
+            "POST",
+            "/api/search/random",
+            json=body,
+            transform=_trim_assets,
+        )
         logger.info(f"Found {len(items)} total assets in person")
         return items
 
+    def _fetch_album_page(self, album_id: str, page: int, etag: str | None = None) -> tuple[list[dict] | None, bool, str | None]:
+        """
+        Fetch one page of album assets.
+
+        Returns (items, has_more, etag); items is None when the server answers
+        304 Not Modified to the If-None-Match sent for etag.
+        """
+        body = {
+            "albumIds": [album_id],
+            "size": ALBUM_PAGE_SIZE,
+            "page": page
+        }
+        headers = {**self.headers, "If-None-Match": etag} if etag else self.headers
+        r = self.session.post(f"{self.base_url}/api/search/metadata", json=body, headers=headers)
+        if r.status_code == 304:
+            return None, False, etag
+        r.raise_for_status()
+        assets_data = r.json().get("assets", {})
+
+        items = assets_data.get("items", [])
+        # Immich reports nextPage (null on the last page); fall back to a short page check
+        if "nextPage" in assets_data:
+            has_more = bool(items) and assets_data["nextPage"] is not None
+        else:
+            has_more = len(items) >= ALBUM_PAGE_SIZE
+        return items, has_more, r.headers.get("ETag")
+
+    def _get_album_asset_count(self, album_id: str) -> int | None:
+        """Number of assets in the album, or None if the server doesn't report it."""
+        r = self.session.get(
+            f"{self.base_url}/api/albums/{album_id}",
+            params={"withoutAssets": "true"},
+            headers=self.headers,
+        )
+        r.raise_for_status()
+        return r.json().get("assetCount")
+
     def get_assets_by_album(self, album_id: str) -> list[dict]:
-        """Fetch all assets from album."""
-        all_items = []
-        page_items = [1]
-        page = 1
+        """
+        Fetch all assets from album.
+
+        The listing is cached on disk (see _cached_request for the revalidation rules,
+        applied here to the first page). The first page is fetched alone since most
+        albums fit in one page. For larger albums the album's assetCount gives the
+        number of pages, which are then fetched concurrently (at most
+        ALBUM_PAGE_CONCURRENCY at a time); if the album grew in the meantime, paging
+        continues one by one until nextPage is null.
+        """
+        cache_key = f"{self.base_url}|album:{album_id}"
+        cached = _get_cached_listing(cache_key)
+        if _is_fresh_without_etag(cached):
+            logger.debug(f"Using cached asset listing for album {album_id}")
+            return cached["value"]
 
         logger.debug(f"Fetching assets from album {album_id}")
-        while page_items:
-            body = {
-                "albumIds": [album_id],
-                "size": 1000,
-                "page": page
-            }
-            r2 = self.session.post(f"{self.base_url}/api/search/metadata", json=body, headers=self.headers)
-            r2.raise_for_status()
-            assets_data = r2.json()
-
-            page_items = assets_data.get("assets", {}).get("items", [])
+        page_items, has_more, etag = self._fetch_album_page(
+            album_id, 1, etag=cached.get("etag") if cached else None
+        )
+        if page_items is None and cached:
+            logger.debug(f"Album {album_id} not modified, using cached asset listing")
+            return cached["value"]
+        all_items = list(page_items or [])
+
+        page = 2
+        if has_more:
+            # search/metadata's own "total" only counts the returned page, so ask the album
+            asset_count = self._get_album_asset_count(album_id) or 0
+            pages = range(2, math.ceil(asset_count / ALBUM_PAGE_SIZE) + 1)
+            if pages:
+                with ThreadPoolExecutor(max_workers=min(ALBUM_PAGE_CONCURRENCY, len(pages))) as executor:
+                    for page_items, has_more, _ in executor.map(lambda p: self._fetch_album_page(album_id, p), pages):
+                        all_items.extend(page_items)
+                page = pages[-1] + 1
+
+        while has_more:
+            page_items, has_more, _ = self._fetch_album_page(album_id, page)
             all_items.extend(page_items)
             page += 1
 
+        all_items = _trim_assets(all_items)
+        _store_cached_listing(cache_key, all_items, etag)
+
         logger.debug(f"Found {len(all_items)} total assets in album")
         return all_items
 
@@ -152,12 +405,10 @@ class ImmichProvider:
         )
         return assets
 
-    def get_image_by_album(self, album: str, dimensions: tuple[int, int], resize: bool = True, orientation: str | None = None) -> tuple[Image.Image | None, dict | None]:
+    def select_asset_by_album(self, album: str, orientation: str | None = None, prefer_illustrated: bool = False) -> dict | None:
         """
-        Get a random image from the album, filtered by orientation if specified.
-
-        Returns:
-            (PIL Image or None, selected_asset dict or None)
+        Pick a random asset from the album, filtered by orientation if specified.
+        With prefer_illustrated, assets with a saved illustration are favoured.
         """
         try:
             logger.info(f"Getting id for album '{album}'")
@@ -167,19 +418,46 @@ class ImmichProvider:
 
             if not assets:
                 logger.error(f"No assets found in album '{album}'")
-                return None, None
+                return None
 
         except Exception as e:
             logger.error(f"Error retrieving album data from {self.base_url}: {e}")
-            return None, None
+            return None
 
         assets = self._filter_assets_by_orientation(assets, orientation, f"album '{album}'")
 
-        selected_asset = choice(assets)
-        asset_id = selected_asset["id"]
-        asset_url = f"{self.base_url}/api/assets/{asset_id}/thumbnail?size=preview"
+        selected_asset = _choose_asset(assets, prefer_illustrated)
+        logger.info(f"Selected random asset: {selected_asset['id']}")
+        return selected_asset
+
+    def select_asset_by_person(self, person_name: str, orientation: str | None = None, prefer_illustrated: bool = False) -> dict | None:
+        """
+        Pick a random asset of the person, filtered by orientation if specified.
+        With prefer_illustrated, assets with a saved illustration are favoured.
+        """
+        try:
+            logger.info(f"Getting id for person '{person_name}'")
+            person_id = self.get_person_id(person_name)
+            logger.info(f"Getting assets from person id {person_id}")
+            assets = self.get_assets_by_person(person_id)
+        except Exception as e:
+            logger.error(f"Error retrieving person data from {self.base_url}: {e}")
+            return None
+
+        if not assets:
+            logger.error(f"No assets found for person '{person_name}'")
+            return None
+
+        assets = self._filter_assets_by_orientation(assets, orientation, f"person '{person_name}'")
 
-        logger.info(f"Selected random asset: {asset_id}")
+        selected_asset = _choose_asset(assets, prefer_illustrated)
+        logger.info(f"Selected random asset: {selected_asset['id']}")
+        return selected_asset
+
+    def load_asset_image(self, asset: dict, dimensions: tuple[int, int], resize: bool = True) -> Image.Image | None:
+        """Download the preview of asset from Immich."""
+        asset_id = asset["id"]
+        asset_url = f"{self.base_url}/api/assets/{asset_id}/thumbnail?size=preview"
         logger.debug(f"Downloading from: {asset_url}")
 
         img = self.image_loader.from_url(
@@ -192,44 +470,36 @@ class ImmichProvider:
 
         if not img:
             logger.error(f"Failed to load image {asset_id} from Immich")
-            return None, None
+            return None
 
         logger.info(f"Successfully loaded image: {img.size[0]}x{img.size[1]}")
-        return img, selected_asset
+        return img
 
-    def get_image_by_person(self, person_name: str, dimensions: tuple[int, int], resize: bool = True, orientation: str | None = None) -> tuple[Image.Image | None, dict | None]:
+    def get_image_by_album(self, album: str, dimensions: tuple[int, int], resize: bool = True, orientation: str | None = None, prefer_illustrated: bool = False) -> tuple[Image.Image | None, dict | None]:
         """
-        Get a random image from the person, filtered by orientation if specified.
+        Get a random image from the album, filtered by orientation if specified.
 
         Returns:
             (PIL Image or None, selected_asset dict or None)
         """
-        try:
-            logger.info(f"Getting id for person '{person_name}'")
-            person_id = self.get_person_id(person_name)
-            logger.info(f"Getting assets from person id {person_id}")
-            assets = self.get_assets_by_person(person_id)
-        except Exception as e:
-            logger.error(f"Error retrieving person data from {self.base_url}: {e}")
+        selected_asset = self.select_asset_by_album(album, orientation, prefer_illustrated)
+        if not selected_asset:
             return None, None
+        img = self.load_asset_image(selected_asset, dimensions, resize=resize)
+        return (img, selected_asset) if img else (None, None)
 
-        assets = self._filter_assets_by_orientation(assets, orientation, f"person '{person_name}'")
-
-        selected_asset = choice(assets)
-        asset_id = selected_asset["id"]
-        asset_url = f"{self.base_url}/api/assets/{asset_id}/thumbnail?size=preview"
-
-        logger.info(f"Selected random asset: {asset_id}")
-        logger.debug(f"Downloading from: {asset_url}")
-
-        img = self.image_loader.from_url(asset_url, dimensions, timeout_ms=40000, resize=resize, headers=self.headers)
+    def get_image_by_person(self, person_name: str, dimensions: tuple[int, int], resize: bool = True, orientation: str | None = None, prefer_illustrated: bool = False) -> tuple[Image.Image | None, dict | None]:
+        """
+        Get a random image from the person, filtered by orientation if specified.
 
-        if not img:
-            logger.error(f"Failed to load image {asset_id} from Immich")
+        Returns:
+            (PIL Image or None, selected_asset dict or None)
+        """
+        selected_asset = self.select_asset_by_person(person_name, orientation, prefer_illustrated)
+        if not selected_asset:
             return None, None
-
-        logger.info(f"Successfully loaded image: {img.size[0]}x{img.size[1]}")
-        return img, selected_asset
+        img = self.load_asset_image(selected_asset, dimensions, resize=resize)
+        return (img, selected_asset) if img else (None, None)
 
 class ImageAlbum(BasePlugin):
     def generate_settings_template(self):
@@ -289,41 +559,53 @@ class ImageAlbum(BasePlugin):
                 load_resize = False if convert_to_illustration else not use_padding
 
                 if person_name:
-                    img, selected_asset = provider.get_image_by_person(person_name, dimensions, resize=load_resize, orientation=orientation)
+                    selected_asset = provider.select_asset_by_person(person_name, orientation=orientation, prefer_illustrated=convert_to_illustration)
                 else:
-                    img, selected_asset = provider.get_image_by_album(album, dimensions, resize=load_resize, orientation=orientation)
+                    selected_asset = provider.select_asset_by_album(album, orientation=orientation, prefer_illustrated=convert_to_illustration)
+
+                # Already illustrated earlier: skip both the download and the (paid) API call
+                illustrated = None
+                if selected_asset and convert_to_illustration:
+                    illustrated = _load_saved_illustration(person_name=person_name, album=album, asset=selected_asset)
+
+                if selected_asset and not illustrated:
+                    img = provider.load_asset_image(selected_asset, dimensions, resize=load_resize)
 
                 # Optional: convert to illustration via AI (modular provider)
-                if img and convert_to_illustration:
-                    illustration_provider_id = settings.get("illustrationProvider", "deapi")
-                    api_key = device_config.load_env_key("DEAPI_TOKEN")
-                    illustration_provider = get_illustration_provider(
-                        illustration_provider_id,
-                        api_key=api_key,
-                    )
-                    if illustration_provider and illustration_provider.is_configured(api_key):
-                        illustrated = illustration_provider.to_illustration(img, is_person=bool(person_name))
-                        if illustrated:
-                            img = illustrated
-                            logger.info("Image converted to illustration successfully")
-                            # Resize illustration to dimensions (done after illustration)
-                            if use_padding:
-                                img = pad_image_blur(img, dimensions)
+                if (img or illustrated) and convert_to_illustration:
+                    if not illustrated:
+                        illustration_provider_id = settings.get("illustrationProvider", "deapi")
+                        api_key = device_config.load_env_key("DEAPI_TOKEN")
+                        illustration_provider = get_illustration_provider(
+                            illustration_provider_id,
+                            api_key=api_key,
+                        )
+                        if illustration_provider and illustration_provider.is_configured(api_key):
+                            illustrated = illustration_provider.to_illustration(img, is_person=bool(person_name))
+                            if illustrated:
+                                logger.info("Image converted to illustration successfully")
+                                # Save illustration to Illustrations/{folder}/{originalFileName}_{assetId}.jpeg
+                                if selected_asset:
+                                    _EXECUTOR.submit(
+                                        _save_illustration,
+                                        illustrated,
+                                        person_name=person_name,
+                                        album=album,
+                                        asset=selected_asset,
+                                    ).add_done_callback(_log_save_failure)
                             else:
-                                img = ImageOps.fit(img, dimensions, method=Image.Resampling.LANCZOS)
-                            illustration_resized = True
-                            # Save illustration to Illustrations/{folder}/{originalFileName}.EXT
-                            if selected_asset:
-                                _save_illustration(
-                                    illustrated,
-                                    person_name=person_name,
-                                    album=album,
-                                    asset=selected_asset,
-                                )
+                                logger.warning("Illustration conversion failed, using original image")
+                        else:
+                            logger.warning("Illustration provider not configured, using original image")
+
+                    if illustrated:
+                        img = illustrated
+                        # Resize illustration to dimensions (done after illustration)
+                        if use_padding:
+                            img = pad_image_blur(img, dimensions, background=blur_background(img, dimensions))
                         else:
-                            logger.warning("Illustration conversion failed, using original image")
-                    else:
-                        logger.warning("Illustration provider not configured, using original image")
+                            img = ImageOps.fit(img, dimensions, method=Image.Resampling.LANCZOS)
+                        illustration_resized = True
 
                 if not img:
                     logger.error("Failed to retrieve image from Immich")
@@ -341,7 +623,7 @@ class ImageAlbum(BasePlugin):
             if use_padding:
                 logger.debug(f"Applying padding with {background_option} background")
                 if background_option == "blur":
-                    img = pad_image_blur(img, dimensions)
+                    img = pad_image_blur(img, dimensions, background=blur_background(img, dimensions))
                 else:
                     background_color = ImageColor.getcolor(
                         settings.get('backgroundColor') or "white",
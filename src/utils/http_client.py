@@ -45,10 +45,11 @@ def get_http_session() -> requests.Session:
         })
 
         # Configure connection pool
-        # Max 10 connections per host (reasonable for e-ink device)
+        # Keep-alive pools for up to 10 hosts, max 16 connections per host so
+        # concurrent paginated fetches against one backend reuse warm sockets
         adapter = requests.adapters.HTTPAdapter(
             pool_connections=10,
-            pool_maxsize=10,
+            pool_maxsize=16,
             max_retries=3,
             pool_block=False
         )
@@ -172,9 +172,20 @@ def take_screenshot(target, dimensions, timeout_ms=None):
 
     return image
 
-def pad_image_blur(img: Image, dimensions: tuple[int, int]) -> Image:
-    bkg = ImageOps.fit(img, dimensions)
-    bkg = bkg.filter(ImageFilter.BoxBlur(8))
+def blur_background(img: Image, dimensions: tuple[int, int], scale: int = 4) -> Image:
+    """Blurred fill for pad_image_blur, blurred at 1/scale resolution then upscaled."""
+    small = (max(1, dimensions[0] // scale), max(1, dimensions[1] // scale))
+    bkg = ImageOps.fit(img, small, method=Image.Resampling.BILINEAR)
+    bkg = bkg.filter(ImageFilter.GaussianBlur(8 / scale))
+    return bkg.resize(dimensions, Image.Resampling.BILINEAR)
+
+def pad_image_blur(img: Image, dimensions: tuple[int, int], background: Image = None) -> Image:
+    """Fit img inside dimensions over a blurred fill; a given background is pasted onto in place."""
+    if background is not None:
+        bkg = background
+    else:
+        bkg = ImageOps.fit(img, dimensions)
+        bkg = bkg.filter(ImageFilter.BoxBlur(8))
     img = ImageOps.contain(img, dimensions)
 
     img_size = img.size
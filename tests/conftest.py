@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Plugin modules import from src/ as the top-level package root (e.g. `from utils...`)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
@@ -0,0 +1,94 @@
+import pytest
+
+from plugins.image_album.illustration_providers import circuit_breaker
+from plugins.image_album.illustration_providers.circuit_breaker import (
+    CircuitBreaker,
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+)
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(circuit_breaker.time, "monotonic", fake)
+    return fake
+
+
+@pytest.fixture
+def breaker(clock):
+    return CircuitBreaker(failure_threshold=3, reset_timeout=300)
+
+
+def _trip(breaker):
+    for _ in range(breaker.failure_threshold):
+        assert breaker.allow_request()
+        breaker.record_failure()
+
+
+class TestCircuitBreaker:
+
+    def test_starts_closed(self, breaker):
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_stays_closed_below_threshold(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_success_resets_failure_count(self, breaker):
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == CLOSED
+
+    def test_opens_after_threshold_failures(self, breaker):
+        _trip(breaker)
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    def test_stays_open_until_reset_timeout(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 299.9
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+    def test_half_open_allows_single_trial(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 300
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+    def test_successful_trial_closes(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 300
+        assert breaker.allow_request()
+        breaker.record_success()
+        assert breaker.state == CLOSED
+        assert breaker.allow_request()
+
+    def test_failed_trial_reopens_for_another_timeout(self, breaker, clock):
+        _trip(breaker)
+        clock.now += 300
+        assert breaker.allow_request()
+        breaker.record_failure()
+        assert breaker.state == OPEN
+        assert not breaker.allow_request()
+
+        clock.now += 300
+        assert breaker.state == HALF_OPEN
+        assert breaker.allow_request()
+
@@ -0,0 +1,128 @@
+import pytest
+from PIL import Image
+
+from plugins.image_album.illustration_providers import deapi_provider
+from plugins.image_album.illustration_providers.circuit_breaker import CircuitBreaker, CLOSED, OPEN
+from plugins.image_album.illustration_providers.deapi_provider import (
+    DeAPIIllustrationProvider,
+    POLL_BASE_INTERVAL,
+    POLL_JITTER,
+    POLL_MAX_INTERVAL,
+    _backoff_delay,
+    _parse_retry_after,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, payload=None):
+        self.status_code = status_code
+        self._payload = payload or {}
+        self.text = ""
+        self.reason = "test"
+
+    def json(self):
+        return self._payload
+
+
+class FakeSession:
+    """Answers every img2img POST with response (or raises it, if it is an exception)."""
+
+    def __init__(self, response):
+        self.response = response
+        self.posts = 0
+
+    def post(self, url, **kwargs):
+        self.posts += 1
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+@pytest.fixture
+def breaker(monkeypatch):
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout=300)
+    monkeypatch.setattr(DeAPIIllustrationProvider, "_breaker", breaker)
+    return breaker
+
+
+def _provider(response):
+    provider = DeAPIIllustrationProvider(api_key="token")
+    provider.session = FakeSession(response)
+    return provider
+
+
+def _photo():
+    return Image.new("RGB", (8, 8), "white")
+
+
+class TestCircuitBreakerWiring:
+
+    def test_open_circuit_skips_encoding_and_post(self, breaker, monkeypatch):
+        for _ in range(3):
+            breaker.record_failure()
+        provider = _provider(FakeResponse(200))
+        monkeypatch.setattr(provider, "_encode_for_upload", lambda image: pytest.fail("encoded while open"))
+
+        assert provider.to_illustration(_photo()) is None
+        assert provider.session.posts == 0
+
+    @pytest.mark.parametrize("response", [
+        FakeResponse(429),
+        FakeResponse(500),
+        FakeResponse(503),
+        ConnectionError("connection reset"),
+    ])
+    def test_rate_limits_server_errors_and_exceptions_count_as_failures(self, breaker, response):
+        provider = _provider(response)
+        for _ in range(3):
+            assert provider.to_illustration(_photo()) is None
+        assert provider.session.posts == 3
+        assert breaker.state == OPEN
+
+        assert provider.to_illustration(_photo()) is None
+        assert provider.session.posts == 3
+
+    @pytest.mark.parametrize("response", [
+        FakeResponse(400),
+        FakeResponse(422),
+        FakeResponse(200, {"data": {}}),  # accepted, but no request_id
+    ])
+    def test_client_errors_and_accepted_requests_count_as_success(self, breaker, response):
+        breaker.record_failure()
+        breaker.record_failure()
+        provider = _provider(response)
+        for _ in range(3):
+            provider.to_illustration(_photo())
+        assert provider.session.posts == 3
+        assert breaker.state == CLOSED
+
+
+class TestPollBackoff:
+
+    @pytest.mark.parametrize("attempt", [0, 1, 2, 3, 4, 10])
+    def test_backoff_delay_is_capped_with_jitter(self, attempt):
+        base = min(POLL_MAX_INTERVAL, POLL_BASE_INTERVAL * 2 ** attempt)
+        for _ in range(50):
+            delay = _backoff_delay(attempt)
+            assert base <= delay <= base + POLL_JITTER
+
+    def test_backoff_delay_starts_at_base_interval(self, monkeypatch):
+        monkeypatch.setattr("random.uniform", lambda a, b: 0)
+        assert _backoff_delay(0) == POLL_BASE_INTERVAL
+        assert _backoff_delay(100) == POLL_MAX_INTERVAL
+
+    @pytest.mark.parametrize(
+        "value,expected",
+        [
+            ("5", 5.0),
+            ("0", 0.0),
+            ("1.5", 1.5),
+            ("-3", 0.0),
+            ("", None),
+            (None, None),
+            ("soon", None),
+            ("Wed, 21 Oct 2015 07:28:00 GMT", None),  # HTTP-date form is ignored
+        ],
+    )
+    def test_parse_retry_after(self, value, expected):
+        assert _parse_retry_after(value) == expected
@@ -0,0 +1,193 @@
+import pytest
+from PIL import Image
+
+from plugins.image_album import image_album
+from plugins.image_album.image_album import ALBUM_PAGE_SIZE, ImmichProvider
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeImmichSession:
+    """Serves an album of asset_count assets the way Immich pages /api/search/metadata."""
+
+    def __init__(self, asset_count):
+        self.asset_count = asset_count
+        self.pages_requested = []
+        self.album_info_requests = 0
+
+    def post(self, url, json=None, headers=None):
+        assert url.endswith("/api/search/metadata")
+        page, size = json["page"], json["size"]
+        self.pages_requested.append(page)
+        start = (page - 1) * size
+        items = [{"id": f"asset-{n}", "originalFileName": f"IMG_{n}.JPG", "width": 4, "height": 3,
+                  "type": "IMAGE"}
+                 for n in range(start, min(start + size, self.asset_count))]
+        has_next = start + size < self.asset_count
+        # total and count both describe the returned page only, as Immich does
+        return FakeResponse({"assets": {
+            "items": items,
+            "total": len(items),
+            "count": len(items),
+            "nextPage": str(page + 1) if has_next else None,
+            "facets": [],
+        }})
+
+    def get(self, url, params=None, headers=None):
+        assert url.endswith("/api/albums/album-1")
+        assert params == {"withoutAssets": "true"}
+        self.album_info_requests += 1
+        return FakeResponse({"id": "album-1", "assetCount": self.asset_count})
+
+
+@pytest.fixture
+def provider(monkeypatch, tmp_path):
+    monkeypatch.setattr(image_album, "LISTING_CACHE_FILE", tmp_path / "immich_listings.json")
+    return ImmichProvider("http://immich.local", "key", image_loader=None)
+
+
+class TestGetAssetsByAlbum:
+
+    def test_single_page_album_makes_one_request(self, provider):
+        provider.session = FakeImmichSession(ALBUM_PAGE_SIZE - 1)
+        assets = provider.get_assets_by_album("album-1")
+        assert len(assets) == ALBUM_PAGE_SIZE - 1
+        assert provider.session.pages_requested == [1]
+        assert provider.session.album_info_requests == 0
+
+    @pytest.mark.parametrize("asset_count,pages", [
+        (ALBUM_PAGE_SIZE + 5, [1, 2]),
+        (3 * ALBUM_PAGE_SIZE + 1, [1, 2, 3, 4]),
+    ])
+    def test_multi_page_album_fetches_each_page_once(self, provider, asset_count, pages):
+        provider.session = FakeImmichSession(asset_count)
+        assets = provider.get_assets_by_album("album-1")
+        assert [a["id"] for a in assets] == [f"asset-{n}" for n in range(asset_count)]
+        assert sorted(provider.session.pages_requested) == pages
+        assert provider.session.album_info_requests == 1
+
+    def test_keeps_paging_when_asset_count_is_stale(self, provider):
+        session = FakeImmichSession(2 * ALBUM_PAGE_SIZE + 5)
+        session.get = lambda url, params=None, headers=None: FakeResponse({"assetCount": ALBUM_PAGE_SIZE + 1})
+        provider.session = session
+        assets = provider.get_assets_by_album("album-1")
+        assert len(assets) == 2 * ALBUM_PAGE_SIZE + 5
+        assert sorted(session.pages_requested) == [1, 2, 3]
+
+    def test_listing_is_trimmed_to_cached_fields(self, provider):
+        provider.session = FakeImmichSession(1)
+        assert provider.get_assets_by_album("album-1") == [
+            {"id": "asset-0", "originalFileName": "IMG_0.JPG", "width": 4, "height": 3}
+        ]
+
+
+class TestChooseAsset:
+
+    @pytest.fixture(autouse=True)
+    def recent_file(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(image_album, "ILLUSTRATIONS_DIR", tmp_path)
+        monkeypatch.setattr(image_album, "RECENT_ILLUSTRATIONS_FILE", tmp_path / ".recent.json")
+
+    @staticmethod
+    def _draws(monkeypatch, *ids):
+        picks = iter(ids)
+
+        def fake_choice(assets):
+            pick = next(picks)
+            return next(a for a in assets if a["id"] == pick)
+
+        monkeypatch.setattr(image_album, "choice", fake_choice)
+
+    def test_keeps_pick_with_saved_illustration(self, monkeypatch):
+        image_album._remember_illustration("a")
+        self._draws(monkeypatch, "a", "b")
+        assert image_album._choose_asset([{"id": "a"}, {"id": "b"}], prefer_illustrated=True)["id"] == "a"
+
+    def test_redraws_pick_without_saved_illustration_once(self, monkeypatch):
+        image_album._remember_illustration("a")
+        self._draws(monkeypatch, "b", "a")
+        assert image_album._choose_asset([{"id": "a"}, {"id": "b"}], prefer_illustrated=True)["id"] == "a"
+
+    def test_second_draw_is_final(self, monkeypatch):
+        self._draws(monkeypatch, "b", "c", "a")
+        assets = [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        assert image_album._choose_asset(assets, prefer_illustrated=True)["id"] == "c"
+
+    def test_plain_choice_without_preference(self, monkeypatch):
+        image_album._remember_illustration("a")
+        self._draws(monkeypatch, "b", "a")
+        assert image_album._choose_asset([{"id": "a"}, {"id": "b"}])["id"] == "b"
+
+    def test_remember_keeps_latest_ids_without_duplicates(self, monkeypatch):
+        monkeypatch.setattr(image_album, "MAX_RECENT_ILLUSTRATIONS", 2)
+        for asset_id in ("a", "b", "a", "c"):
+            image_album._remember_illustration(asset_id)
+        assert image_album._load_recent_illustrations() == ["a", "c"]
+
+
+class TestSavedIllustrations:
+
+    ASSET = {"id": "0b5e-41", "originalFileName": "IMG_1058.JPG"}
+
+    @pytest.fixture(autouse=True)
+    def illustrations_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(image_album, "ILLUSTRATIONS_DIR", tmp_path)
+        return tmp_path
+
+    @staticmethod
+    def _write(path, color):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        Image.new("RGB", (4, 4), color).save(path, format="JPEG")
+
+    def test_path_includes_asset_id(self, illustrations_dir):
+        path = image_album._illustration_path(person_name="Daapu", album=None, asset=self.ASSET)
+        assert path == illustrations_dir / "Daapu" / "IMG_1058_0b5e-41.jpeg"
+
+    def test_legacy_path_omits_asset_id(self, illustrations_dir):
+        path = image_album._illustration_path(person_name=None, album="Trip", asset=self.ASSET, legacy=True)
+        assert path == illustrations_dir / "Trip" / "IMG_1058.jpeg"
+
+    def test_path_sanitizes_components(self, illustrations_dir):
+        asset = {"id": "x", "originalFileName": "a:b.jpg"}
+        path = image_album._illustration_path(person_name=None, album="A/B", asset=asset)
+        assert path == illustrations_dir / "AB" / "ab_x.jpeg"
+
+    def test_missing_illustration_loads_none(self):
+        assert image_album._load_saved_illustration(person_name="Daapu", album=None, asset=self.ASSET) is None
+
+    def test_loads_legacy_illustration(self, illustrations_dir):
+        self._write(illustrations_dir / "Daapu" / "IMG_1058.jpeg", "red")
+        img = image_album._load_saved_illustration(person_name="Daapu", album=None, asset=self.ASSET)
+        assert img.mode == "RGB" and img.getpixel((0, 0))[0] > 200
+
+    def test_prefers_asset_id_path_over_legacy(self, illustrations_dir):
+        self._write(illustrations_dir / "Daapu" / "IMG_1058.jpeg", "red")
+        self._write(illustrations_dir / "Daapu" / "IMG_1058_0b5e-41.jpeg", "blue")
+        img = image_album._load_saved_illustration(person_name="Daapu", album=None, asset=self.ASSET)
+        assert img.getpixel((0, 0))[2] > 200
+
+    def test_unreadable_illustration_is_deleted(self, illustrations_dir):
+        path = illustrations_dir / "Daapu" / "IMG_1058_0b5e-41.jpeg"
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"not a jpeg")
+        assert image_album._load_saved_illustration(person_name="Daapu", album=None, asset=self.ASSET) is None
+        assert not path.exists()
+
+    def test_saved_illustration_is_reused(self, monkeypatch, illustrations_dir):
+        monkeypatch.setattr(image_album, "RECENT_ILLUSTRATIONS_FILE", illustrations_dir / ".recent.json")
+        image_album._save_illustration(Image.new("RGB", (4, 4), "green"), person_name=None, album="Trip", asset=self.ASSET)
+        assert sorted(p.name for p in (illustrations_dir / "Trip").iterdir()) == ["IMG_1058_0b5e-41.jpeg"]
+        assert image_album._load_saved_illustration(person_name=None, album="Trip", asset=self.ASSET).size == (4, 4)
+        assert image_album._load_recent_illustrations() == ["0b5e-41"]